@@ -0,0 +1,238 @@
+# harness.py  -- child process wrapper used by run_benchmarks.py
+#
+# Usage:
+#   python harness.py <stage> <repo_root> <result.json>
+#   python harness.py --setup <stage> <repo_root>
+#
+# Runs one stage in a fresh interpreter (cwd = synthetic dataset dir) and writes
+# timing + peak memory for that stage only to <result.json>. Timings include the
+# imports the stage needs, so lazy-import regressions show up as well. Fixtures
+# a stage needs (see SETUP) are built before the timer starts; `--setup` builds
+# them only, so the runner can keep them out of the stage's wall time too.
+import json
+import os
+import resource
+import sys
+import time
+
+
+def _peak_rss_mb():
+    # ru_maxrss survives exec on Linux, so it would include the runner's own peak;
+    # VmHWM belongs to this process image only. Both are in KiB.
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, int(round(q / 100.0 * (len(values) - 1)))))
+    return values[k]
+
+
+def stage_clean(base):
+    from energyd.cleaning import run_cleaning
+    run_cleaning(base)
+    return {}
+
+
+def stage_features(base):
+    from energyd.cleaning import read_processed_opsd
+    from energyd.features import build_features
+    df = read_processed_opsd(base)
+    t0 = time.perf_counter()
+    build_features(df)
+    return {"compute_s": time.perf_counter() - t0}
+
+
+def stage_train(base):
+    from energyd.training import run_training
+    run_training(base, show_plot=False)
+    return {}
+
+
+def stage_dayahead(base):
+    from energyd.dispatch import run_dayahead
+    run_dayahead(base)
+    return {}
+
+
+def stage_dispatch(base):
+    from energyd.dispatch import run_robust_dispatch
+    run_robust_dispatch(base)
+    return {}
+
+
+def stage_pipeline(base):
+    from energyd.pipeline import run_pipeline
+    run_pipeline(base)
+    return {}
+
+
+def stage_online(base, hours=24 * 60):
+    """Stream the last `hours` of actuals through the online updater."""
+    from energyd import config
+    from energyd.cleaning import read_processed_opsd
+    from energyd.online import OnlineUpdater
+    from energyd.serving import load_model
+
+    df = read_processed_opsd(base).tail(hours)
+    updater = OnlineUpdater(load_model(os.path.join(base, config.MODEL_PATH)))
+    extra_cols = [c for c in df.columns if c != "load"]
+    observe_ms, update_s = [], []
+    for ts, row in zip(df.index, df.to_dict("records")):
+        extras = {c: row[c] for c in extra_cols}
+        t = time.perf_counter()
+        updated = updater.observe(ts, row["load"], **extras)
+        if updated:
+            update_s.append(time.perf_counter() - t)
+        else:
+            observe_ms.append((time.perf_counter() - t) * 1000.0)
+    return {
+        "observe_p50_ms": _percentile(observe_ms, 50),
+        "update_mean_s": sum(update_s) / len(update_s) if update_s else 0.0,
+        "updates": len(update_s),
+    }
+
+
+def setup_render(base, n_runs=20):
+    """Write `n_runs` dispatch-shaped results spanning the whole dataset (once)."""
+    import numpy as np
+    import pandas as pd
+    from energyd.cleaning import read_processed_opsd
+
+    runs_dir = os.path.join(base, "bench_runs")
+    if not os.path.isdir(runs_dir):
+        df = read_processed_opsd(base).fillna(0.0)
+        rng = np.random.default_rng(0)
+        tmp_dir = f"{runs_dir}.tmp{os.getpid()}"
+        os.makedirs(tmp_dir)
+        for i in range(n_runs):
+            scale = rng.normal(1.0, 0.05, len(df))
+            run = pd.DataFrame({
+                "hour": np.arange(len(df)),
+                "solar_used": df["solar"].values * scale,
+                "wind_used": df["wind"].values * scale,
+            })
+            run["gas_used"] = np.clip(df["load"].values - run["solar_used"] - run["wind_used"], 0, None)
+            run["soc"] = np.cumsum(rng.normal(0, 100.0, len(df))) % 10000.0
+            run["total_gen"] = run["solar_used"] + run["wind_used"] + run["gas_used"]
+            run.to_csv(os.path.join(tmp_dir, f"run_{i:03d}.csv"), index=False)
+        os.rename(tmp_dir, runs_dir)
+
+
+def stage_render(base):
+    """Render the setup runs cold, then again from the image cache."""
+    import shutil
+
+    from energyd.visualize import render_many
+
+    runs_dir = os.path.join(base, "bench_runs")
+    out_dir = os.path.join(base, "bench_figures")
+    shutil.rmtree(out_dir, ignore_errors=True)
+
+    t0 = time.perf_counter()
+    render_many([runs_dir], out_dir)
+    cold = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    render_many([runs_dir], out_dir)
+    warm = time.perf_counter() - t0
+    return {"render_cold_s": cold, "render_cached_s": warm}
+
+
+def stage_serve(base, n_requests=500, shared=False):
+    """Measure cold start, prediction latency and /data latency.
+
+    With `shared`, records are published to a shared-memory store and /data is
+    served by an app attached to it as a reader, as in the multi-worker mode.
+    """
+    t0 = time.perf_counter()
+    from energyd import config, serving
+    model = serving.load_model(os.path.join(base, config.MODEL_PATH))
+    if shared:
+        from energyd.store import SharedPredictionStore
+        store_name = f"energyd_bench_{os.getpid()}"
+        buffer = SharedPredictionStore.create(store_name)
+        reader = SharedPredictionStore.attach(store_name)
+    else:
+        buffer = reader = serving.PredictionBuffer()
+    client = serving.create_app(reader).test_client()
+    cold_start = time.perf_counter() - t0
+
+    weather = {"temp": 12.5, "humidity": 70, "wind": 4.1, "clouds": 40,
+               "main": "Clouds", "desc": "broken clouds", "icon": "04d"}
+    predict_ms = []
+    for _ in range(n_requests):
+        t = time.perf_counter()
+        pred = serving.predict_energy(model, weather)
+        predict_ms.append((time.perf_counter() - t) * 1000.0)
+
+    # a full buffer of records, as served after ~1 hour of polling
+    for _ in range(serving.MAX_RECORDS):
+        buffer.append(serving.make_record(weather, pred))
+    data_ms = []
+    t_all = time.perf_counter()
+    for _ in range(n_requests):
+        t = time.perf_counter()
+        res = client.get("/data")
+        data_ms.append((time.perf_counter() - t) * 1000.0)
+        assert res.status_code == 200
+    total = time.perf_counter() - t_all
+    if shared:
+        reader.close()
+        buffer.close()
+
+    return {
+        "cold_start_s": cold_start,
+        "predict_p50_ms": _percentile(predict_ms, 50),
+        "predict_p95_ms": _percentile(predict_ms, 95),
+        "data_p50_ms": _percentile(data_ms, 50),
+        "data_p95_ms": _percentile(data_ms, 95),
+        "requests_per_s": n_requests / total,
+    }
+
+
+STAGES = {
+    "clean": stage_clean,
+    "features": stage_features,
+    "train": stage_train,
+    "dayahead": stage_dayahead,
+    "dispatch": stage_dispatch,
+    "pipeline": stage_pipeline,
+    "online": stage_online,
+    "render": stage_render,
+    "serve": stage_serve,
+    "serve_shared": lambda base: stage_serve(base, shared=True),
+}
+
+# untimed fixture builders, run before a stage's timer starts
+SETUP = {
+    "render": setup_render,
+}
+
+
+if __name__ == "__main__":
+    setup_only = sys.argv[1] == "--setup"
+    args = sys.argv[2:] if setup_only else sys.argv[1:]
+    stage, repo_root = args[0], args[1]
+    if stage not in STAGES:
+        raise SystemExit(f"Unknown stage: {stage}")
+    sys.path.insert(0, repo_root)
+
+    if stage in SETUP:
+        SETUP[stage](os.getcwd())
+    if setup_only:
+        sys.exit(0)
+
+    out = args[2]
+    t0 = time.perf_counter()
+    metrics = STAGES[stage](os.getcwd())
+    metrics["elapsed_s"] = time.perf_counter() - t0
+    metrics["peak_rss_mb"] = _peak_rss_mb()
+    with open(out, "w") as f:
+        json.dump(metrics, f)
@@ -0,0 +1,222 @@
+# run_benchmarks.py  -- offline benchmark suite on synthetic datasets
+#
+# Examples:
+#   python benchmarks/run_benchmarks.py --scale 1y
+#   python benchmarks/run_benchmarks.py --scale 10y --stages clean features train
+#   python benchmarks/run_benchmarks.py --scale 1y --save-baseline
+#
+# Every stage runs through the energyd library in its own interpreter (cwd =
+# generated dataset dir), so the peak memory and wall time are per stage. Each
+# run is appended to benchmarks/results/history.jsonl; if benchmarks/baseline.json
+# has an entry for the scale, metrics are compared and the exit code is 1 on
+# regression.
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from synthetic_data import SCALES, ensure_dataset
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+HARNESS = os.path.join(BENCH_DIR, "harness.py")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+HISTORY_FILE = os.path.join(RESULTS_DIR, "history.jsonl")
+BASELINE_FILE = os.path.join(BENCH_DIR, "baseline.json")
+PROCESSED = os.path.join("data", "processed")
+
+# name -> (files required in the dataset dir, rows processed)
+CLEANED = os.path.join(PROCESSED, "opsd_de_hourly.csv")
+STAGES = {
+    "clean": ([], lambda spec: spec["uci_rows"] + spec["opsd_rows"]),
+    "features": ([CLEANED], lambda spec: spec["opsd_rows"]),
+    "train": ([CLEANED], lambda spec: spec["opsd_rows"]),
+    "dayahead": ([CLEANED], lambda spec: 30),
+    "dispatch": ([CLEANED], lambda spec: 24 * 7),
+    # OPSD clean -> features -> train -> dispatch in one process, no intermediate CSVs
+    "pipeline": ([], lambda spec: spec["opsd_rows"]),
+    # streaming actuals -> incremental features -> continued boosting
+    "online": ([CLEANED, "energy_forecast_model.pkl"], lambda spec: min(spec["opsd_rows"], 24 * 60)),
+    # 20 full-length dispatch runs, rendered headless: cold, then from the cache
+    "render": ([CLEANED], lambda spec: 20 * spec["opsd_rows"]),
+    "serve": (["energy_forecast_model.pkl"], None),
+    "serve_shared": (["energy_forecast_model.pkl"], None),
+}
+
+# stages whose fixtures are built by `harness.py --setup` in a separate, untimed
+# process, and the metric their rows/s is based on (default: elapsed_s)
+SETUP_STAGES = {"render"}
+RATE_TIMER = {"render": "render_cold_s"}
+
+# raw bytes parsed per stage. Cleaning keeps only the DE columns, so at the
+# 100zones scale its rows match 1y and only the scan of the wider OPSD file
+# (header + usecols) grows with the zone count.
+INPUT_BYTES = {
+    "clean": lambda spec: spec["uci_bytes"] + spec["opsd_bytes"],
+}
+
+# metrics where a larger value is better; everything else numeric is "lower is better"
+HIGHER_IS_BETTER = {"rows_per_s", "requests_per_s", "mb_per_s"}
+# absolute differences below these are treated as noise
+NOISE_FLOOR = {"_s": 0.05, "_ms": 0.5, "_mb": 5.0}
+SKIP_COMPARE = {"rows", "updates", "input_mb", "opsd_columns"}
+
+
+def git_rev():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def run_stage(name, workdir, spec, log_dir):
+    """Run one stage in a child interpreter and return its metrics."""
+    rows_fn = STAGES[name][1]
+    result_path = os.path.join(workdir, f".bench_{name}.json")
+    log_path = os.path.join(log_dir, f"{spec['scale']}_{name}.log")
+
+    env = dict(os.environ, MPLBACKEND="Agg", PYTHONUNBUFFERED="1")
+    with open(log_path, "w") as log:
+        if name in SETUP_STAGES:
+            proc = subprocess.run([sys.executable, HARNESS, "--setup", name, REPO_ROOT],
+                                  cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT)
+            if proc.returncode != 0:
+                raise RuntimeError(f"Setup of stage '{name}' failed (exit {proc.returncode}), see {log_path}")
+        t0 = time.perf_counter()
+        proc = subprocess.run([sys.executable, HARNESS, name, REPO_ROOT, result_path],
+                              cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT)
+    wall = time.perf_counter() - t0
+    if proc.returncode != 0:
+        raise RuntimeError(f"Stage '{name}' failed (exit {proc.returncode}), see {log_path}")
+
+    with open(result_path) as f:
+        metrics = json.load(f)
+    os.remove(result_path)
+    metrics["wall_s"] = wall
+    if rows_fn is not None:
+        metrics["rows"] = rows_fn(spec)
+        metrics["rows_per_s"] = metrics["rows"] / metrics[RATE_TIMER.get(name, "elapsed_s")]
+    if name in INPUT_BYTES:
+        metrics["input_mb"] = INPUT_BYTES[name](spec) / 2 ** 20
+        metrics["mb_per_s"] = metrics["input_mb"] / metrics["elapsed_s"]
+        metrics["opsd_columns"] = spec["opsd_columns"]
+    return metrics
+
+
+def _median_metrics(runs):
+    keys = runs[0].keys()
+    return {k: statistics.median(r[k] for r in runs) for k in keys}
+
+
+def _noise_floor(metric):
+    for suffix, floor in NOISE_FLOOR.items():
+        if metric.endswith(suffix):
+            return floor
+    return 0.0
+
+
+def compare(current, baseline, tolerance):
+    """Return a list of human-readable regressions of `current` vs `baseline`."""
+    regressions = []
+    for stage, base_metrics in baseline.items():
+        if stage not in current:
+            continue
+        for metric, base in base_metrics.items():
+            if metric in SKIP_COMPARE or metric not in current[stage]:
+                continue
+            value = current[stage][metric]
+            if metric in HIGHER_IS_BETTER:
+                worse = value < base * (1.0 - tolerance)
+            else:
+                worse = (value > base * (1.0 + tolerance)
+                         and value - base > _noise_floor(metric))
+            if worse:
+                change = (value - base) / base * 100.0 if base else float("inf")
+                regressions.append(
+                    f"{stage}.{metric}: {value:.4g} vs baseline {base:.4g} ({change:+.1f}%)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite.")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="1y")
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--repeat", type=int, default=1, help="runs per stage (median is kept)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", default=os.path.join(BENCH_DIR, ".data"),
+                        help="where synthetic datasets are generated and cached")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative slowdown before flagging a regression")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store this run as the baseline for the scale")
+    args = parser.parse_args(argv)
+
+    workdir = os.path.join(os.path.abspath(args.workdir), f"{args.scale}-s{args.seed}")
+    spec = ensure_dataset(workdir, args.scale, args.seed)
+    log_dir = os.path.join(RESULTS_DIR, "logs")
+    os.makedirs(log_dir, exist_ok=True)
+
+    stages = {}
+    for name in STAGES:
+        if name not in args.stages:
+            continue
+        missing = [p for p in STAGES[name][0] if not os.path.exists(os.path.join(workdir, p))]
+        if missing:
+            print(f"⚠️ Skipping {name}: missing {missing} (run the earlier stages first)")
+            continue
+        runs = [run_stage(name, workdir, spec, log_dir) for _ in range(args.repeat)]
+        stages[name] = _median_metrics(runs)
+        m = stages[name]
+        extra = f" | {m['rows_per_s']:.0f} rows/s" if "rows_per_s" in m else ""
+        extra += f" | {m['mb_per_s']:.1f} MB/s" if "mb_per_s" in m else ""
+        extra += f" | {m['requests_per_s']:.0f} req/s" if "requests_per_s" in m else ""
+        print(f"⏱️ {name:<12} {m['wall_s']:8.2f}s wall | {m['peak_rss_mb']:8.1f} MB peak{extra}")
+
+    record = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_rev": git_rev(),
+        "python": platform.python_version(),
+        "host": platform.node(),
+        "scale": args.scale,
+        "seed": args.seed,
+        "stages": stages,
+    }
+    with open(HISTORY_FILE, "a") as f:
+        f.write(json.dumps(record) + "\n")
+    print("Appended results to:", HISTORY_FILE)
+
+    baselines = {}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE) as f:
+            baselines = json.load(f)
+
+    if args.save_baseline:
+        baselines[args.scale] = stages
+        with open(BASELINE_FILE, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print("✅ Saved baseline for", args.scale, "to", BASELINE_FILE)
+        return 0
+
+    if args.scale not in baselines:
+        print("No baseline for", args.scale, "- use --save-baseline to store one.")
+        return 0
+
+    regressions = compare(stages, baselines[args.scale], args.tolerance)
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) vs baseline (tolerance {args.tolerance:.0%}):")
+        for r in regressions:
+            print("   ", r)
+        return 1
+    print("✅ No regressions vs baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+# synthetic_data.py  -- generate UCI- and OPSD-shaped files for offline benchmarks
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+UCI_FILE = "household_power_consumption.txt"
+OPSD_FILE = "time_series_60min_singleindex.csv"
+SPEC_FILE = ".synthetic_spec.json"
+
+# Scales: years of history and number of OPSD zones (DE is always zone 0)
+SCALES = {
+    "smoke": {"start": "2015-01-01", "days": 60, "zones": 1},
+    "1y": {"start": "2015-01-01", "days": 365, "zones": 1},
+    "10y": {"start": "2006-12-16", "days": 3652, "zones": 1},
+    "100zones": {"start": "2015-01-01", "days": 365, "zones": 100},
+}
+
+# German TSO sub-zones appear as extra DE_ columns in the real OPSD file
+DE_SUBZONES = ["DE_50hertz", "DE_amprion", "DE_tennet", "DE_transnetbw", "DE_LU"]
+
+UCI_COLUMNS = [
+    "Global_active_power", "Global_reactive_power", "Voltage",
+    "Global_intensity", "Sub_metering_1", "Sub_metering_2", "Sub_metering_3",
+]
+
+
+def zone_names(n):
+    """Zone prefixes: DE first, then German sub-zones, then synthetic codes."""
+    names = ["DE"] + DE_SUBZONES
+    names += [f"Z{i:03d}" for i in range(n - len(names))]
+    return names[:n]
+
+
+def _daily_profile(hours):
+    """Smooth double-peak (morning + evening) household profile in [0, 1]."""
+    morning = np.exp(-0.5 * ((hours - 8.0) / 1.5) ** 2)
+    evening = np.exp(-0.5 * ((hours - 19.5) / 2.0) ** 2)
+    return 0.15 + 0.45 * morning + 0.8 * evening
+
+
+def _gap_mask(rng, n, gap_fraction, max_gap):
+    """Boolean mask with contiguous missing runs, like the sensor outages in UCI."""
+    mask = np.zeros(n, dtype=bool)
+    n_gaps = max(1, int(n * gap_fraction / (max_gap / 2)))
+    starts = rng.integers(0, n, n_gaps)
+    lengths = rng.integers(1, max_gap, n_gaps)
+    for s, l in zip(starts, lengths):
+        mask[s:s + l] = True
+    return mask
+
+
+def write_uci(path, start, days, seed=0, chunk_days=365):
+    """Write a minute-level UCI household file (';' separated, '?' for missing)."""
+    rng = np.random.default_rng(seed)
+    minutes = np.arange(1440)
+    time_str = np.array([f"{m // 60:02d}:{m % 60:02d}:00" for m in minutes])
+    profile = _daily_profile(minutes / 60.0)
+
+    first = True
+    day0 = pd.Timestamp(start)
+    n_rows = 0
+    for offset in range(0, days, chunk_days):
+        n_days = min(chunk_days, days - offset)
+        dates = pd.date_range(day0 + pd.Timedelta(days=offset), periods=n_days, freq="D")
+        # UCI uses d/m/YYYY without zero padding
+        date_str = np.array([f"{d.day}/{d.month}/{d.year}" for d in dates])
+        n = n_days * 1440
+
+        doy = np.repeat(dates.dayofyear.values, 1440)
+        seasonal = 1.0 + 0.35 * np.cos(2 * np.pi * (doy - 15) / 365.25)
+        weekend = np.repeat((dates.dayofweek.values >= 5), 1440)
+        active = np.tile(profile, n_days) * seasonal * np.where(weekend, 1.15, 1.0) * 1.6
+        active = np.clip(active + rng.gamma(1.5, 0.12, n) - 0.1, 0.08, 10.0)
+        reactive = np.clip(0.12 + 0.05 * active + rng.normal(0, 0.04, n), 0.0, 1.4)
+        voltage = 240.8 - 1.2 * active + rng.normal(0, 1.8, n)
+        intensity = active * 1000.0 / voltage
+        sub1 = np.where(rng.random(n) < 0.04, rng.integers(1, 40, n), 0)
+        sub2 = np.where(rng.random(n) < 0.10, rng.integers(1, 30, n), 0)
+        sub3 = np.where(active > 1.0, rng.integers(5, 20, n), rng.integers(0, 2, n))
+
+        df = pd.DataFrame({
+            "Date": np.repeat(date_str, 1440),
+            "Time": np.tile(time_str, n_days),
+            "Global_active_power": active,
+            "Global_reactive_power": reactive,
+            "Voltage": voltage,
+            "Global_intensity": intensity,
+            "Sub_metering_1": sub1.astype(float),
+            "Sub_metering_2": sub2.astype(float),
+            "Sub_metering_3": sub3.astype(float),
+        })
+        gaps = _gap_mask(rng, n, 0.0125, 240)
+        df.loc[gaps, UCI_COLUMNS] = np.nan
+
+        df.to_csv(path, sep=";", index=False, header=first, mode="w" if first else "a",
+                  na_rep="?", float_format="%.3f")
+        first = False
+        n_rows += n
+    return n_rows
+
+
+def write_opsd(path, start, days, zones=1, seed=0):
+    """Write an hourly OPSD singleindex file with load/price/solar/wind per zone."""
+    rng = np.random.default_rng(seed + 1)
+    idx = pd.date_range(pd.Timestamp(start), periods=days * 24, freq="h")
+    n = len(idx)
+    hours = idx.hour.values
+    doy = idx.dayofyear.values
+    weekend = idx.dayofweek.values >= 5
+
+    cols = {
+        "utc_timestamp": idx.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "cet_cest_timestamp": (idx + pd.Timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%S+0100"),
+    }
+    for z, name in enumerate(zone_names(zones)):
+        scale = 55000.0 if name == "DE" else rng.uniform(2000.0, 20000.0)
+        daily = 0.8 + 0.2 * np.sin(2 * np.pi * (hours - 6) / 24.0)
+        seasonal = 1.0 + 0.1 * np.cos(2 * np.pi * (doy - 15) / 365.25)
+        load = scale * daily * seasonal * np.where(weekend, 0.85, 1.0)
+        load = load * (1.0 + rng.normal(0, 0.02, n))
+
+        daylight = np.clip(np.sin(np.pi * (hours - 6) / 12.0), 0.0, None)
+        sun_season = 0.6 + 0.4 * np.cos(2 * np.pi * (doy - 172) / 365.25)
+        solar = 0.35 * scale * daylight * sun_season * rng.uniform(0.4, 1.0, n)
+
+        # wind: positive AR(1) process
+        shocks = rng.normal(0, 1.0, n)
+        w = np.empty(n)
+        w[0] = 0.0
+        for t in range(1, n):
+            w[t] = 0.97 * w[t - 1] + shocks[t]
+        wind = 0.25 * scale * (1.0 + np.tanh(w / 6.0))
+
+        residual = load - solar - wind
+        price = 35.0 + 40.0 * residual / scale + rng.normal(0, 5.0, n)
+
+        cols[f"{name}_load_actual_entsoe_transparency"] = load
+        cols[f"{name}_load_forecast_entsoe_transparency"] = load * (1.0 + rng.normal(0, 0.03, n))
+        cols[f"{name}_price_day_ahead"] = price
+        cols[f"{name}_solar_generation_actual"] = solar
+        cols[f"{name}_wind_generation_actual"] = wind
+
+    df = pd.DataFrame(cols)
+    value_cols = df.columns[2:]
+    # sparse missing values, as in the real file
+    holes = rng.random((n, len(value_cols))) < 0.002
+    df[value_cols] = df[value_cols].mask(holes)
+    df.to_csv(path, index=False, float_format="%.2f")
+    return n
+
+
+def _file_sizes(workdir):
+    """Raw input bytes and the OPSD column count (what grows with `zones`)."""
+    with open(os.path.join(workdir, OPSD_FILE)) as f:
+        opsd_columns = len(f.readline().split(","))
+    return {
+        "uci_bytes": os.path.getsize(os.path.join(workdir, UCI_FILE)),
+        "opsd_bytes": os.path.getsize(os.path.join(workdir, OPSD_FILE)),
+        "opsd_columns": opsd_columns,
+    }
+
+
+def ensure_dataset(workdir, scale, seed=0):
+    """Generate the files for `scale` in `workdir`, reusing them if already present.
+
+    Returns a dict with the dataset spec, row counts and file sizes.
+    """
+    if scale not in SCALES:
+        raise ValueError(f"Unknown scale '{scale}'. Available: {sorted(SCALES)}")
+    spec = dict(SCALES[scale], scale=scale, seed=seed)
+    os.makedirs(workdir, exist_ok=True)
+    spec_path = os.path.join(workdir, SPEC_FILE)
+
+    if os.path.exists(spec_path):
+        with open(spec_path) as f:
+            cached = json.load(f)
+        if {k: cached.get(k) for k in spec} == spec:
+            return dict(cached, **_file_sizes(workdir))
+
+    print(f"🧪 Generating synthetic '{scale}' dataset in {workdir} ...")
+    uci_rows = write_uci(os.path.join(workdir, UCI_FILE), spec["start"], spec["days"], seed)
+    opsd_rows = write_opsd(os.path.join(workdir, OPSD_FILE), spec["start"], spec["days"],
+                           spec["zones"], seed)
+    spec.update(uci_rows=uci_rows, opsd_rows=opsd_rows)
+    with open(spec_path, "w") as f:
+        json.dump(spec, f, indent=2)
+    print(f"✅ UCI rows: {uci_rows}, OPSD rows: {opsd_rows}, zones: {spec['zones']}")
+    return dict(spec, **_file_sizes(workdir))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic UCI/OPSD datasets.")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="1y")
+    parser.add_argument("--out", default=".", help="output directory")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    ensure_dataset(args.out, args.scale, args.seed)
@@ -0,0 +1,43 @@
+"""Energy demand forecasting and dispatch.
+
+Stages are plain functions over pandas frames and can be chained in one process::
+
+    from energyd import clean_opsd, build_features, train_model, robust_dispatch
+
+    opsd = clean_opsd("time_series_60min_singleindex.csv")
+    model, metrics, predictions = train_model(build_features(opsd))
+    results, scenarios = robust_dispatch(opsd)
+
+Submodules are imported on first attribute access, so ``import energyd`` stays cheap.
+"""
+import importlib
+
+_EXPORTS = {
+    "clean_uci": "cleaning",
+    "clean_opsd": "cleaning",
+    "common_range": "cleaning",
+    "run_cleaning": "cleaning",
+    "build_features": "features",
+    "add_time_features": "features",
+    "train_model": "training",
+    "save_model": "training",
+    "run_training": "training",
+    "optimize_dayahead": "dispatch",
+    "robust_dispatch": "dispatch",
+    "plot_dispatch": "visualize",
+    "render_dispatch": "visualize",
+    "render_many": "visualize",
+    "load_model": "serving",
+    "predict_energy": "serving",
+    "create_app": "serving",
+    "run_pipeline": "pipeline",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(f".{_EXPORTS[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,31 @@
+# check.py  -- view contents of both raw datasets
+import os
+
+import pandas as pd
+
+from . import config
+
+
+def run_check(base):
+    print("\n📂 Checking datasets in", base, "\n")
+    uci_file = os.path.join(base, config.RAW_UCI_FILE)
+    opsd_file = os.path.join(base, config.RAW_OPSD_FILE)
+
+    for file in [uci_file, opsd_file]:
+        if os.path.exists(file):
+            size = os.path.getsize(file) / (1024 * 1024)
+            print(f"✅ Found: {file} ({size:.1f} MB)")
+        else:
+            print(f"❌ Missing: {file}")
+
+    print("\n────────────────────────────")
+    print("🏠 UCI Household Dataset (first 10 rows)")
+    print("────────────────────────────")
+    print(pd.read_csv(uci_file, sep=';', nrows=10).to_string(index=False))
+
+    print("\n────────────────────────────")
+    print("⚡ OPSD Dataset (first 10 rows)")
+    print("────────────────────────────")
+    print(pd.read_csv(opsd_file, nrows=10).to_string(index=False))
+
+    print("\n✅ Done — both datasets previewed successfully.")
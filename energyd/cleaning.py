@@ -0,0 +1,139 @@
+# cleaning.py  -- UCI household and OPSD (DE) cleaning to hourly frames
+import os
+
+import pandas as pd
+
+from . import config
+
+UCI_COLUMNS = [
+    'Global_active_power', 'Global_reactive_power', 'Voltage',
+    'Global_intensity', 'Sub_metering_1', 'Sub_metering_2', 'Sub_metering_3'
+]
+
+
+def clean_uci(path):
+    """Load the minute-level UCI file and return an hourly, gap-filled frame."""
+    df = pd.read_csv(path, sep=';', na_values=['?'], low_memory=False)
+
+    # combine Date + Time; dayfirst=True because format is dd/mm/YYYY
+    df['dt'] = pd.to_datetime(
+        df['Date'].astype(str).str.strip() + ' ' + df['Time'].astype(str).str.strip(),
+        dayfirst=True, errors='coerce'
+    )
+    df = df.drop(columns=['Date', 'Time'])
+    df = df.set_index('dt').sort_index()
+
+    for col in df.columns:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+
+    hourly = df.resample('h').mean()
+    # fill small gaps
+    hourly = hourly.ffill(limit=6).interpolate(limit_direction='both', limit=24)
+
+    out = hourly[[c for c in UCI_COLUMNS if c in hourly.columns]].copy()
+    out.index.name = 'utc_timestamp'
+    return out
+
+
+def _select_de_columns(columns):
+    """Map short names (load, price, solar, wind) to the first matching DE column."""
+    selected = {}
+    for c in columns:
+        cl = c.lower()
+        if 'load_actual' in cl and 'load' not in selected:
+            selected['load'] = c
+        if 'price_day_ahead' in cl and 'price' not in selected:
+            selected['price'] = c
+        if 'solar_generation' in cl and 'solar' not in selected:
+            selected['solar'] = c
+        if 'wind_generation' in cl and 'wind' not in selected:
+            selected['wind'] = c
+    return selected
+
+
+def clean_opsd(path):
+    """Load the DE subset of the OPSD singleindex file as an hourly frame.
+
+    Only the timestamp and ``DE_`` columns are read. Columns are renamed to
+    ``load``, ``price``, ``solar`` and ``wind`` when detected.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        header = f.readline().strip().split(',')
+
+    ts_col_candidates = [h for h in header if 'utc_timestamp' in h]
+    if not ts_col_candidates:
+        raise RuntimeError("Could not find timestamp column in OPSD header.")
+    ts_col = ts_col_candidates[0]
+
+    de_cols = [c for c in header if c.startswith('DE_')]
+    if not de_cols:
+        raise RuntimeError("No DE_ columns found in OPSD header; adjust if the layout differs.")
+
+    # read only timestamp + DE columns (safe and memory-light)
+    df = pd.read_csv(path, usecols=[ts_col] + de_cols, parse_dates=[ts_col])
+    df = df.set_index(ts_col).sort_index()
+
+    selected = _select_de_columns(df.columns)
+    # fallback: take first 4 DE columns if detection failed
+    chosen_cols = list(selected.values()) or de_cols[:4]
+    df_de = df[chosen_cols].copy()
+    df_de = df_de.rename(columns={v: k for k, v in selected.items()})
+
+    # tz-aware -> tz-naive UTC, so it lines up with UCI
+    if getattr(df_de.index, 'tz', None) is not None:
+        df_de.index = df_de.index.tz_convert('UTC').tz_localize(None)
+
+    df_de = df_de.interpolate(limit=6).ffill().bfill()
+    return df_de.resample('h').mean()
+
+
+def common_range(uci, opsd):
+    """Trim both frames to their overlapping period; None if they do not overlap."""
+    uci_min, uci_max = uci.index.min(), uci.index.max()
+    opsd_min, opsd_max = opsd.index.min(), opsd.index.max()
+    if pd.isna(uci_min) or pd.isna(opsd_min):
+        return None
+    start, end = max(uci_min, opsd_min), min(uci_max, opsd_max)
+    if start >= end:
+        return None
+    return uci.loc[start:end], opsd.loc[start:end]
+
+
+def read_processed_opsd(base):
+    """Read the cleaned OPSD file written by :func:`run_cleaning`."""
+    path = config.processed_path(base, config.OPSD_CLEAN_FILE)
+    return pd.read_csv(path, parse_dates=['utc_timestamp'], index_col='utc_timestamp')
+
+
+def run_cleaning(base):
+    """Clean both raw files under `base` and write them to data/processed."""
+    out_dir = os.path.join(base, config.PROCESSED_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+
+    print("1) Loading UCI household data...")
+    uci = clean_uci(os.path.join(base, config.RAW_UCI_FILE))
+    uci_fn = os.path.join(out_dir, config.UCI_CLEAN_FILE)
+    uci.to_csv(uci_fn, float_format='%.4f')
+    print("Saved UCI cleaned:", uci_fn)
+    print("UCI time span:", uci.index.min(), "->", uci.index.max())
+
+    print("2) Loading OPSD (DE columns)...")
+    opsd = clean_opsd(os.path.join(base, config.RAW_OPSD_FILE))
+    opsd_fn = os.path.join(out_dir, config.OPSD_CLEAN_FILE)
+    opsd.to_csv(opsd_fn, float_format='%.4f')
+    print("Saved OPSD DE cleaned:", opsd_fn)
+    print("OPSD time span:", opsd.index.min(), "->", opsd.index.max())
+
+    print("3) Attempting to determine common date range...")
+    trimmed = common_range(uci, opsd)
+    if trimmed is None:
+        print("No overlapping date range found — skipping trimmed files.")
+    else:
+        uci_trim, opsd_trim = trimmed
+        uci_trim.to_csv(os.path.join(out_dir, "uci_hourly_cleaned_trimmed.csv"), float_format='%.4f')
+        opsd_trim.to_csv(os.path.join(out_dir, "opsd_de_hourly_trimmed.csv"), float_format='%.4f')
+        print("Common range:", uci_trim.index.min(), "->", uci_trim.index.max())
+        print("Saved trimmed files to data/processed/")
+
+    print("\nALL DONE.")
+    return uci, opsd
@@ -0,0 +1,169 @@
+# cli.py  -- single entry point: python -m energyd <command>
+#
+# Heavy dependencies (pandas, lightgbm, sklearn, pyomo, matplotlib, flask) are
+# imported inside each command, so a command only pays for what it uses.
+import argparse
+import os
+import sys
+
+from . import config
+
+
+def cmd_check(args):
+    from .check import run_check
+    run_check(args.base)
+
+
+def cmd_clean(args):
+    from .cleaning import run_cleaning
+    run_cleaning(args.base)
+
+
+def cmd_train(args):
+    from .training import run_training
+    run_training(args.base, show_plot=args.plot)
+
+
+def cmd_dayahead(args):
+    from .dispatch import run_dayahead
+    run_dayahead(args.base)
+
+
+def cmd_dispatch(args):
+    from .dispatch import run_robust_dispatch
+    run_robust_dispatch(args.base)
+
+
+def cmd_visualize(args):
+    from .visualize import run_visualize
+    index = run_visualize(args.base, args.results, out_dir=args.out, show=args.show, jobs=args.jobs,
+                          max_points=args.max_points, method=args.method)
+    if index and any("error" in entry for entry in index.values()):
+        return 1
+
+
+def cmd_pipeline(args):
+    from .pipeline import run_pipeline
+    run_pipeline(args.base, dispatch=not args.no_dispatch)
+
+
+def cmd_serve(args):
+    model_path = os.path.join(args.base, args.model)
+    if args.workers:
+        from .production import serve_production
+        try:
+            serve_production(host=args.host, port=args.port, workers=args.workers,
+                             interval_seconds=args.interval, model_path=model_path,
+                             store_name=args.store, actuals_path=args.actuals)
+        except RuntimeError as e:
+            raise SystemExit(f"❌ {e}")
+    else:
+        from .serving import serve
+        serve(host=args.host, port=args.port, interval_seconds=args.interval,
+              model_path=model_path, actuals_path=args.actuals)
+
+
+def cmd_poller(args):
+    from .production import run_poller
+    try:
+        run_poller(store_name=args.store, model_path=os.path.join(args.base, args.model),
+                   interval_seconds=args.interval, actuals_path=args.actuals)
+    except RuntimeError as e:
+        raise SystemExit(f"❌ {e}")
+
+
+def cmd_update(args):
+    from .online import ActualsFeed, OnlineUpdater
+    from .serving import load_model
+    from .training import save_model
+
+    model_path = os.path.join(args.base, args.model)
+    model = load_model(model_path)
+    if model is None:
+        raise SystemExit(f"❌ No model to update at {model_path} (run `energyd train` first).")
+    try:
+        updater = OnlineUpdater(model, window_hours=args.window_hours, new_trees=args.new_trees)
+    except ValueError as e:
+        raise SystemExit(f"❌ {e}")
+    records = ActualsFeed(args.actuals).read_new()
+    updater.observe_many(records)
+    if not updater.updates and not updater.n_pending and updater.trained_until is not None:
+        print(f"✅ No new actuals since {updater.trained_until}; model unchanged.")
+        return
+    if not updater.updates:
+        if updater.n_rows < updater.min_rows:
+            raise SystemExit(f"❌ Not enough actuals for an update ({len(records)} rows read).")
+        updater.update()
+    save_model(updater.model, model_path)
+    print(f"✅ Updated on the last {updater.n_rows} hours "
+          f"({updater.model.booster_.num_trees()} trees), saved {model_path}")
+
+
+def _add_poller_args(p):
+    p.add_argument("--interval", type=float, default=10, help="polling interval in seconds")
+    p.add_argument("--model", default=config.MODEL_PATH, help="model path (relative to --base)")
+    p.add_argument("--store", default=os.environ.get("ENERGYD_STORE", "energyd_predictions"),
+                   help="shared-memory store name (env ENERGYD_STORE)")
+    p.add_argument("--actuals", help="CSV of observed load (utc_timestamp,load,...) to learn from online")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="energyd", description="Energy demand forecasting and dispatch.")
+    parser.add_argument("--base", default=os.getcwd(),
+                        help="working directory with raw files and data/processed (default: cwd)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("check", help="preview the raw UCI and OPSD files").set_defaults(func=cmd_check)
+    sub.add_parser("clean", help="clean + resample raw data to data/processed").set_defaults(func=cmd_clean)
+
+    p = sub.add_parser("train", help="build features and train the short-term forecaster")
+    p.add_argument("--plot", action="store_true", help="show actual vs predicted plot")
+    p.set_defaults(func=cmd_train)
+
+    sub.add_parser("dayahead", help="day-ahead generation mix optimisation").set_defaults(func=cmd_dayahead)
+    sub.add_parser("dispatch", help="robust hourly dispatch with storage").set_defaults(func=cmd_dispatch)
+
+    p = sub.add_parser("visualize", help="render robust dispatch results (headless, cached)")
+    p.add_argument("results", nargs="*",
+                   help="results CSVs or directories of them (default: data/processed/robust_dispatch_results.csv)")
+    p.add_argument("--out", help="image directory (default: data/processed/figures)")
+    p.add_argument("--jobs", type=int, help="parallel render processes (default: all cores)")
+    p.add_argument("--max-points", type=int, default=2000, help="downsample series to at most this many points (0: off)")
+    p.add_argument("--method", choices=["lttb", "minmax"], default="lttb", help="downsampling method")
+    p.add_argument("--show", action="store_true", help="open interactive windows instead of writing images")
+    p.set_defaults(func=cmd_visualize)
+
+    p = sub.add_parser("pipeline", help="clean -> features -> train -> dispatch in one process")
+    p.add_argument("--no-dispatch", action="store_true", help="stop after training")
+    p.set_defaults(func=cmd_pipeline)
+
+    p = sub.add_parser("serve", help="live weather polling + dashboard")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=5000)
+    p.add_argument("--workers", type=int, default=0,
+                   help="HTTP worker processes fed by one poller, on werkzeug's dev server "
+                        "(0: single process; use gunicorn + `poller` in production)")
+    _add_poller_args(p)
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser("update", help="continue training the model on recent actuals")
+    p.add_argument("actuals", help="CSV of observed load (utc_timestamp,load[,price,solar,wind])")
+    p.add_argument("--model", default=config.MODEL_PATH, help="model path (relative to --base)")
+    p.add_argument("--window-hours", type=int, default=24 * 28, help="most recent hours to train on")
+    p.add_argument("--new-trees", type=int, default=25, help="boosting rounds added per update")
+    p.set_defaults(func=cmd_update)
+
+    p = sub.add_parser("poller", help="publish live predictions to shared memory for external WSGI workers")
+    _add_poller_args(p)
+    p.set_defaults(func=cmd_poller)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.base = os.path.abspath(args.base)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+# config.py  -- file names and service settings shared by the pipeline stages
+import os
+
+# Raw downloads (Kaggle / OPSD), expected in the working directory
+RAW_UCI_FILE = "household_power_consumption.txt"
+RAW_OPSD_FILE = "time_series_60min_singleindex.csv"
+
+# Processed outputs, relative to the working directory
+PROCESSED_DIR = os.path.join("data", "processed")
+UCI_CLEAN_FILE = "uci_hourly_cleaned.csv"
+OPSD_CLEAN_FILE = "opsd_de_hourly.csv"
+PREDICTIONS_FILE = "shortterm_predictions.csv"
+SCENARIOS_FILE = "probabilistic_scenarios.csv"
+DAYAHEAD_FILE = "dayahead_optimization.csv"
+DISPATCH_FILE = "robust_dispatch_results.csv"
+
+MODEL_PATH = "energy_forecast_model.pkl"
+
+# ---- OpenWeather API Config ----
+CITY_NAME = "Berlin"
+CITY_ID = 2950159
+API_KEY = os.environ.get("OPENWEATHER_API_KEY", "616abd91a0bff781545c2d5cd31fa774")
+TIMEZONE = "Asia/Kolkata"
+
+
+def processed_path(base, name):
+    """Path of a processed file under `base`/data/processed."""
+    return os.path.join(base, PROCESSED_DIR, name)
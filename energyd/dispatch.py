@@ -0,0 +1,170 @@
+# dispatch.py  -- day-ahead and robust (scenario-based) dispatch with Pyomo
+import numpy as np
+import pandas as pd
+
+from . import config
+from .cleaning import read_processed_opsd
+
+# Costs ($/MWh)
+COST_SOLAR = 15
+COST_WIND = 25
+COST_GAS = 70
+
+# Emissions (kg CO₂/MWh) and their weight in the objective
+EM_SOLAR = 0
+EM_WIND = 0
+EM_GAS = 500
+EMISSION_WEIGHT = 0.02
+
+SOLVER = 'appsi_highs'
+
+
+def dispatch_inputs(df):
+    """Select load/solar/wind/price and fill gaps (some columns may be NaN)."""
+    return df[['load', 'solar', 'wind', 'price']].interpolate().ffill()
+
+
+def optimize_dayahead(df, days=30):
+    """Least-cost daily mix of solar, wind and gas over the last `days` days."""
+    from pyomo.environ import (
+        ConcreteModel, Var, Objective, Constraint, NonNegativeReals, SolverFactory, minimize
+    )
+
+    # Aggregate by day (sum load, mean price)
+    daily = dispatch_inputs(df).resample('D').agg(
+        {'load': 'sum', 'solar': 'sum', 'wind': 'sum', 'price': 'mean'}).dropna()
+    data = daily.tail(days)
+    day_idx = list(range(len(data)))
+    load = data['load'].values
+
+    m = ConcreteModel()
+    m.solar = Var(day_idx, domain=NonNegativeReals, bounds=(0, data['solar'].max()))
+    m.wind = Var(day_idx, domain=NonNegativeReals, bounds=(0, data['wind'].max()))
+    # gas can cover any residual load
+    m.gas = Var(day_idx, domain=NonNegativeReals, bounds=(0, data['load'].max()))
+
+    m.obj = Objective(expr=sum(
+        (COST_SOLAR + EMISSION_WEIGHT * EM_SOLAR) * m.solar[d]
+        + (COST_WIND + EMISSION_WEIGHT * EM_WIND) * m.wind[d]
+        + (COST_GAS + EMISSION_WEIGHT * EM_GAS) * m.gas[d]
+        for d in day_idx), sense=minimize)
+    m.demand_constraint = Constraint(
+        day_idx, rule=lambda m, d: m.solar[d] + m.wind[d] + m.gas[d] >= load[d])
+
+    SolverFactory(SOLVER).solve(m, tee=False)
+
+    results = pd.DataFrame({
+        'day': data.index,
+        'solar_used': [m.solar[d]() for d in day_idx],
+        'wind_used': [m.wind[d]() for d in day_idx],
+        'gas_used': [m.gas[d]() for d in day_idx],
+        'demand': load,
+    })
+    results['total_cost'] = (
+        results['solar_used'] * COST_SOLAR +
+        results['wind_used'] * COST_WIND +
+        results['gas_used'] * COST_GAS
+    )
+    return results
+
+
+def make_scenarios(data, n_scenarios=5, seed=42):
+    """Perturb load (±5%) and solar/wind (±10%) to simulate probabilistic forecasts."""
+    np.random.seed(seed)
+    scenarios = []
+    for s in range(n_scenarios):
+        scenario = data.copy()
+        scenario['load'] *= np.random.normal(1.0, 0.05, len(data))
+        scenario['solar'] *= np.random.normal(1.0, 0.10, len(data))
+        scenario['wind'] *= np.random.normal(1.0, 0.10, len(data))
+        scenario['scenario'] = s
+        scenarios.append(scenario)
+    return pd.concat(scenarios)
+
+
+def robust_dispatch(df, hours=24 * 7, n_scenarios=5, seed=42, battery_share=0.2, eff=0.9):
+    """Hourly dispatch with battery storage that meets load in every scenario.
+
+    Uses the last `hours` rows of `df`. Returns ``(results, scenarios_df)``.
+    """
+    from pyomo.environ import (
+        ConcreteModel, Var, Objective, Constraint, NonNegativeReals, SolverFactory, minimize
+    )
+
+    data = dispatch_inputs(df).tail(hours)
+    scenarios_df = make_scenarios(data, n_scenarios, seed)
+    hour_idx = range(len(data))
+
+    solar_cap = data['solar'].max()
+    wind_cap = data['wind'].max()
+    gas_cap = data['load'].max()
+    battery_cap = battery_share * gas_cap  # battery size = 20% of peak load
+
+    # Must meet load in all scenarios (robust): lowest load seen at each hour of day
+    min_load = scenarios_df.groupby(scenarios_df.index.hour)['load'].min()
+
+    m = ConcreteModel()
+    m.solar = Var(hour_idx, domain=NonNegativeReals)
+    m.wind = Var(hour_idx, domain=NonNegativeReals)
+    m.gas = Var(hour_idx, domain=NonNegativeReals)
+    m.charge = Var(hour_idx, domain=NonNegativeReals)
+    m.discharge = Var(hour_idx, domain=NonNegativeReals)
+    m.soc = Var(hour_idx, domain=NonNegativeReals)
+
+    # The plan is deterministic, so the expected cost over scenarios is the plan cost
+    m.obj = Objective(expr=sum(
+        COST_SOLAR * m.solar[t] + COST_WIND * m.wind[t]
+        + (COST_GAS + EMISSION_WEIGHT * EM_GAS) * m.gas[t]
+        for t in hour_idx), sense=minimize)
+
+    def balance_rule(m, t):
+        return (m.solar[t] + m.wind[t] + m.gas[t] + m.discharge[t] - m.charge[t]
+                >= min_load.get(t % 24, 0.0))
+    m.balance = Constraint(hour_idx, rule=balance_rule)
+
+    def storage_rule(m, t):
+        prev = 0.5 * battery_cap if t == 0 else m.soc[t - 1]
+        return m.soc[t] == prev + eff * m.charge[t] - m.discharge[t] / eff
+    m.storage = Constraint(hour_idx, rule=storage_rule)
+
+    m.soc_cap = Constraint(hour_idx, rule=lambda m, t: m.soc[t] <= battery_cap)
+    m.solar_cap = Constraint(hour_idx, rule=lambda m, t: m.solar[t] <= solar_cap)
+    m.wind_cap = Constraint(hour_idx, rule=lambda m, t: m.wind[t] <= wind_cap)
+    m.gas_cap = Constraint(hour_idx, rule=lambda m, t: m.gas[t] <= gas_cap)
+
+    SolverFactory(SOLVER).solve(m)
+
+    results = pd.DataFrame({
+        'hour': list(hour_idx),
+        'solar_used': [m.solar[t]() for t in hour_idx],
+        'wind_used': [m.wind[t]() for t in hour_idx],
+        'gas_used': [m.gas[t]() for t in hour_idx],
+        'soc': [m.soc[t]() for t in hour_idx],
+    })
+    results['total_gen'] = results['solar_used'] + results['wind_used'] + results['gas_used']
+    return results, scenarios_df
+
+
+def run_dayahead(base):
+    """Day-ahead optimisation on the cleaned OPSD file; writes dayahead_optimization.csv."""
+    results = optimize_dayahead(read_processed_opsd(base))
+    print("\n✅ Optimization done!")
+    print(results.head())
+    out_file = config.processed_path(base, config.DAYAHEAD_FILE)
+    results.to_csv(out_file, index=False)
+    print("Saved optimized schedule:", out_file)
+    return results
+
+
+def run_robust_dispatch(base):
+    """Robust dispatch on the cleaned OPSD file; writes scenarios and dispatch results."""
+    results, scenarios_df = robust_dispatch(read_processed_opsd(base))
+    scenarios_df.to_csv(config.processed_path(base, config.SCENARIOS_FILE))
+    print(f"Generated {scenarios_df['scenario'].nunique()} probabilistic forecast scenarios.")
+
+    out_csv = config.processed_path(base, config.DISPATCH_FILE)
+    results.to_csv(out_csv, index=False)
+    print("✅ Robust optimization complete!")
+    print("Saved results to:", out_csv)
+    print(results.head())
+    return results
@@ -0,0 +1,34 @@
+# features.py  -- time, lag and rolling features for the short-term forecaster
+TARGET = 'load'
+LAGS = [1, 2, 3, 6, 12, 24]
+WINDOWS = [3, 6, 12, 24]
+
+
+def add_time_features(df):
+    """Add hour / dayofweek / month / is_weekend columns from the index (in place)."""
+    df['hour'] = df.index.hour
+    df['dayofweek'] = df.index.dayofweek
+    df['month'] = df.index.month
+    df['is_weekend'] = (df['dayofweek'] >= 5).astype(int)
+    return df
+
+
+def build_features(df, target=TARGET):
+    """Return a copy of `df` with time, lag and rolling features, NaN rows dropped."""
+    if target not in df.columns:
+        raise ValueError(f"'{target}' column not found. Available: {df.columns.tolist()}")
+
+    df = df.interpolate().ffill().bfill()
+    add_time_features(df)
+
+    # previous hour values
+    for lag in LAGS:
+        df[f'lag_{lag}'] = df[target].shift(lag)
+
+    prev = df[target].shift(1)
+    for window in WINDOWS:
+        rolling = prev.rolling(window)
+        df[f'roll_mean_{window}'] = rolling.mean()
+        df[f'roll_std_{window}'] = rolling.std()
+
+    return df.dropna()
@@ -0,0 +1,334 @@
+# online.py  -- keep the forecaster fresh from streaming load actuals
+#
+# Observed load arrives as rows of a CSV (utc_timestamp,load[,price,solar,wind])
+# that some meter/ETL process appends to. The poller tails it, keeps the lag and
+# rolling features up to date incrementally, and every `update_every` hours
+# continues boosting the current LightGBM model on the recent window only
+# (init_model=booster). When the model grows past `max_trees` it is refit from
+# scratch on the window instead. Updated models are swapped in for prediction
+# and saved atomically to the model path. Each updated model records the last
+# hour it was trained on (`trained_until_`), so re-reading the same actuals
+# after a restart or from cron does not train on them again.
+import collections
+import math
+import os
+
+import pandas as pd
+
+from .features import LAGS, TARGET, WINDOWS
+from .training import MODEL_PARAMS, save_model
+
+HISTORY_HOURS = max(max(LAGS), max(WINDOWS))
+HOUR = pd.Timedelta(hours=1)
+
+
+def _to_hour(timestamp):
+    """UTC, tz-naive timestamp floored to the hour (matches the cleaned OPSD index)."""
+    ts = pd.Timestamp(timestamp)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert('UTC').tz_localize(None)
+    return ts.floor('h')
+
+
+def time_features(ts):
+    """Same calendar features as :func:`energyd.features.add_time_features`."""
+    dayofweek = ts.dayofweek
+    return {
+        'hour': ts.hour,
+        'dayofweek': dayofweek,
+        'month': ts.month,
+        'is_weekend': int(dayofweek >= 5),
+    }
+
+
+class FeatureState:
+    """Last `history` hourly loads, giving lag / rolling features in O(window).
+
+    Features describe the hour after the last observation, exactly as
+    ``shift(lag)`` and ``shift(1).rolling(window)`` do in the batch pipeline.
+    Short gaps are filled by linear interpolation; longer gaps reset the state.
+    """
+
+    def __init__(self, history=HISTORY_HOURS):
+        self._loads = collections.deque(maxlen=history)
+        self.last_timestamp = None
+        self.extras = {}
+
+    @property
+    def ready(self):
+        return len(self._loads) == self._loads.maxlen
+
+    def update(self, ts, load, extras=None):
+        """Record the load for hour `ts` (corrections of the latest hour allowed)."""
+        if self.last_timestamp is not None and ts <= self.last_timestamp:
+            if ts == self.last_timestamp:
+                self._loads[-1] = load
+                if extras:
+                    self.extras.update(extras)
+            return  # older hours are already past
+        self.fill_gap(ts, load)
+        self.append(ts, load, extras)
+
+    def fill_gap(self, ts, load):
+        """Interpolate hours missing between the last observation and `ts`."""
+        if self.last_timestamp is None:
+            return
+        missing = int((ts - self.last_timestamp) / HOUR) - 1
+        if missing >= self._loads.maxlen:
+            self._loads.clear()
+        elif missing > 0:
+            prev = self._loads[-1]
+            for i in range(1, missing + 1):
+                self._loads.append(prev + (load - prev) * i / (missing + 1))
+
+    def append(self, ts, load, extras=None):
+        if extras:
+            self.extras.update(extras)
+        self._loads.append(load)
+        self.last_timestamp = ts
+
+    def features(self):
+        """Lag and rolling features for the next hour; empty until `ready`."""
+        if not self.ready:
+            return {}
+        loads = list(self._loads)
+        out = {f'lag_{lag}': loads[-lag] for lag in LAGS}
+        for window in WINDOWS:
+            values = loads[-window:]
+            mean = sum(values) / window
+            var = sum((v - mean) ** 2 for v in values) / (window - 1)
+            out[f'roll_mean_{window}'] = mean
+            out[f'roll_std_{window}'] = math.sqrt(var)
+        return out
+
+
+class OnlineUpdater:
+    """Recent labelled rows plus the model they continue to train.
+
+    Each observation becomes one training row once the feature state is warm.
+    Only the last `window_hours` rows are kept, so an update costs the same no
+    matter how much history the original model was trained on.
+    """
+
+    def __init__(self, model, window_hours=24 * 28, update_every=24, new_trees=25,
+                 max_trees=1000, min_rows=48):
+        self.window_hours = window_hours
+        self.update_every = update_every
+        self.new_trees = new_trees
+        self.max_trees = max_trees
+        self.min_rows = min_rows
+        self.state = FeatureState()
+        self.updates = 0
+        self._rows = collections.deque(maxlen=window_hours)
+        self._targets = collections.deque(maxlen=window_hours)
+        self._last_row_ts = None
+        self._pending = 0
+        self.feature_names = None
+        self.set_model(model)
+
+    def set_model(self, model):
+        """Continue from `model` (e.g. one retrained elsewhere).
+
+        The training window is dropped if the model expects different features;
+        the feature state is kept either way. Hours up to the model's
+        `trained_until_` (if set) do not count towards the next update.
+        """
+        if not hasattr(model, 'booster_'):
+            raise ValueError("Online updates need a fitted LightGBM model.")
+        feature_names = list(model.feature_name_)
+        if feature_names != self.feature_names:
+            self._rows.clear()
+            self._targets.clear()
+            self._last_row_ts = None
+            self._pending = 0
+        self.model = model
+        self.feature_names = feature_names
+        self.trained_until = getattr(model, 'trained_until_', None)
+        # a full refit uses the original size, not the size of the last increment;
+        # small windows make LightGBM warn about every unsplittable leaf, so keep it quiet
+        self._params = dict(model.get_params(), n_estimators=MODEL_PARAMS['n_estimators'], verbose=-1)
+
+    def _row(self, ts, extras):
+        values = dict(self.state.extras, **extras)
+        values.update(time_features(ts))
+        values.update(self.state.features())
+        return [float(values.get(c, 0.0) or 0.0) for c in self.feature_names]
+
+    def observe(self, timestamp, load, update=True, **extras):
+        """Ingest one hourly actual; returns True if the model was updated."""
+        ts = _to_hour(timestamp)
+        load = float(load)
+        last = self.state.last_timestamp
+        if last is not None and ts <= last:
+            if ts == self._last_row_ts:
+                # correction of the latest hour: its lag features are unchanged,
+                # only the target and exogenous values are
+                self._targets[-1] = load
+                row = self._rows[-1]
+                for i, c in enumerate(self.feature_names):
+                    if c in extras:
+                        row[i] = float(extras[c] or 0.0)
+            self.state.update(ts, load, extras)
+            return False
+
+        self.state.fill_gap(ts, load)
+        if self.state.ready:
+            self._rows.append(self._row(ts, extras))
+            self._targets.append(load)
+            self._last_row_ts = ts
+            if self.trained_until is None or ts > self.trained_until:
+                self._pending += 1
+        self.state.append(ts, load, extras)
+        if update and self.update_due:
+            self.update()
+            return True
+        return False
+
+    def observe_many(self, records):
+        """Ingest ``(timestamp, load, extras)`` records, then update once if due."""
+        for timestamp, load, extras in records:
+            self.observe(timestamp, load, update=False, **extras)
+        if self.update_due:
+            self.update()
+            return True
+        return False
+
+    @property
+    def n_rows(self):
+        """Labelled rows currently in the training window."""
+        return len(self._rows)
+
+    @property
+    def n_pending(self):
+        """Rows the model has not been trained on yet."""
+        return self._pending
+
+    @property
+    def update_due(self):
+        return self._pending >= self.update_every and self.n_rows >= self.min_rows
+
+    def update(self):
+        """Continue boosting on the recent window (or refit it if the model is too big)."""
+        import lightgbm as lgb
+
+        X = pd.DataFrame(list(self._rows), columns=self.feature_names)
+        y = pd.Series(list(self._targets), name=TARGET)
+        booster = self.model.booster_
+        if booster.num_trees() + self.new_trees > self.max_trees:
+            model = lgb.LGBMRegressor(**self._params)
+            model.fit(X, y)
+        else:
+            model = lgb.LGBMRegressor(**dict(self._params, n_estimators=self.new_trees))
+            model.fit(X, y, init_model=booster)
+        model.trained_until_ = self.trained_until = self._last_row_ts
+        self.model = model
+        self._pending = 0
+        self.updates += 1
+        return model
+
+    def live_features(self):
+        """Lag / rolling / exogenous / calendar features for predicting the next hour.
+
+        The calendar features are those of the hour after the last actual (UTC,
+        as in training), so they override the local-time ones of the live row.
+        """
+        features = dict(self.state.extras, **self.state.features())
+        if self.state.last_timestamp is not None:
+            features.update(time_features(self.state.last_timestamp + HOUR))
+        return features
+
+
+class ActualsFeed:
+    """Tail a growing CSV of observed load; only complete lines are consumed."""
+
+    def __init__(self, path):
+        self.path = path
+        self._offset = 0
+        self._partial = b""
+        self._header = None
+
+    def read_new(self):
+        """Return ``(timestamp, load, extras)`` for rows appended since the last call."""
+        if not os.path.exists(self.path):
+            return []
+        if os.path.getsize(self.path) < self._offset:
+            # truncated or rotated: start over
+            self._offset, self._partial, self._header = 0, b"", None
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            chunk = f.read()
+        self._offset += len(chunk)
+
+        lines = (self._partial + chunk).split(b"\n")
+        self._partial = lines.pop()
+        records = []
+        for raw in lines:
+            line = raw.decode('utf-8').strip()
+            if not line:
+                continue
+            fields = line.split(',')
+            if self._header is None:
+                self._header = fields
+                continue
+            row = dict(zip(self._header, fields))
+            try:
+                timestamp = row.pop('utc_timestamp')
+                load = float(row.pop(TARGET))
+                extras = {k: float(v) for k, v in row.items() if v != ''}
+            except (KeyError, ValueError) as e:
+                print("⚠️ Skipping malformed actuals line:", line, e)
+                continue
+            records.append((timestamp, load, extras))
+        return records
+
+
+class StreamingModel:
+    """The poller's model: ingests the actuals feed and hot-swaps updated models.
+
+    Also reloads `model_path` if something else (e.g. a full ``energyd train``)
+    replaced it, keeping the warm feature state.
+    """
+
+    def __init__(self, model, actuals_path, model_path, **updater_kwargs):
+        self.updater = OnlineUpdater(model, **updater_kwargs)
+        self.feed = ActualsFeed(actuals_path)
+        self.model_path = model_path
+        self._mtime = self._model_mtime()
+
+    def _model_mtime(self):
+        try:
+            return os.stat(self.model_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _reload_if_replaced(self):
+        mtime = self._model_mtime()
+        if mtime is None or mtime == self._mtime:
+            return
+        import joblib
+
+        self._mtime = mtime
+        try:
+            self.updater.set_model(joblib.load(self.model_path))
+        except Exception as e:
+            print("⚠️ Keeping the current model, could not reload", self.model_path, e)
+            return
+        print("🔄 Reloaded replaced model:", self.model_path)
+
+    @property
+    def model(self):
+        return self.updater.model
+
+    def refresh(self):
+        """Ingest new actuals, update if due, and return the model to predict with."""
+        self._reload_if_replaced()
+        records = self.feed.read_new()
+        if records and self.updater.observe_many(records):
+            save_model(self.updater.model, self.model_path)
+            self._mtime = self._model_mtime()
+            print(f"🧠 Online update #{self.updater.updates}: "
+                  f"{self.updater.model.booster_.num_trees()} trees, saved {self.model_path}")
+        return self.updater.model
+
+    def live_features(self):
+        return self.updater.live_features()
@@ -0,0 +1,33 @@
+# pipeline.py  -- clean -> features -> train -> dispatch in one process
+import os
+
+from . import config
+from .cleaning import clean_opsd
+from .dispatch import robust_dispatch
+from .features import build_features
+from .training import save_model, train_model
+
+
+def run_pipeline(base, dispatch=True):
+    """Run the OPSD path end to end, passing frames between stages in memory.
+
+    Only the final artifacts are written: the model and (optionally) the
+    robust dispatch results.
+    """
+    opsd = clean_opsd(os.path.join(base, config.RAW_OPSD_FILE))
+    print("OPSD (DE) hourly:", opsd.shape)
+
+    model, metrics, _ = train_model(build_features(opsd))
+    print(f"✅ Model trained | MAE: {metrics['mae']:.2f} | R²: {metrics['r2']:.3f}")
+    model_path = os.path.join(base, config.MODEL_PATH)
+    save_model(model, model_path)
+    print("Saved model:", model_path)
+
+    results = None
+    if dispatch:
+        results, _ = robust_dispatch(opsd)
+        os.makedirs(os.path.join(base, config.PROCESSED_DIR), exist_ok=True)
+        out_csv = config.processed_path(base, config.DISPATCH_FILE)
+        results.to_csv(out_csv, index=False)
+        print("✅ Robust dispatch saved:", out_csv)
+    return model, metrics, results
@@ -0,0 +1,115 @@
+# production.py  -- multi-process serving: one poller, N HTTP workers
+#
+# Production: one poller plus an external WSGI server
+#
+#   python -m energyd poller &
+#   gunicorn -w 8 "energyd.production:wsgi_app()"
+#
+# `python -m energyd serve --workers 8` runs the same layout in one command for
+# local use; its workers are werkzeug development servers.
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+import socket
+import sys
+import time
+
+from . import config
+from .store import DEFAULT_NAME, SharedPredictionStore
+
+
+def _exit_on_sigterm():
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+
+def run_poller(store_name=DEFAULT_NAME, model_path=config.MODEL_PATH, interval_seconds=10, ready=None,
+               actuals_path=None):
+    """Poll the weather API, predict, and publish records into the shared store.
+
+    This is the only process that talks to the weather API, loads the model or
+    applies online updates from `actuals_path`. `ready` (an Event) is set once
+    the store exists and workers can attach. Raises RuntimeError if another
+    poller is already publishing to `store_name`.
+    """
+    from .serving import load_model, streaming_model, update_live_data
+
+    _exit_on_sigterm()
+    store = SharedPredictionStore.create(store_name)
+    if ready is not None:
+        ready.set()
+    try:
+        model = load_model(model_path)
+        update_live_data(model, store, interval_seconds,
+                         online=streaming_model(model, actuals_path, model_path))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.close()
+
+
+def wsgi_app(store_name=None):
+    """Flask app that reads predictions from the shared store (one per worker)."""
+    from .serving import create_app
+
+    store_name = store_name or os.environ.get("ENERGYD_STORE", DEFAULT_NAME)
+    return create_app(SharedPredictionStore.attach(store_name))
+
+
+def _run_worker(sock, host, port, store_name):
+    from werkzeug.serving import make_server
+
+    _exit_on_sigterm()
+    server = make_server(host, port, wsgi_app(store_name), threaded=True, fd=sock.fileno())
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+def serve_production(host="127.0.0.1", port=5000, workers=None, interval_seconds=10,
+                     model_path=config.MODEL_PATH, store_name=DEFAULT_NAME, actuals_path=None):
+    """Start the poller and `workers` pre-forked HTTP processes sharing one socket.
+
+    Workers accept connections from the same listening socket, so requests are
+    spread across cores. The call blocks until interrupted or a child exits.
+    Each worker is a werkzeug development server; for production traffic put
+    :func:`wsgi_app` behind gunicorn (or similar) and run :func:`run_poller`.
+    """
+    workers = workers or os.cpu_count() or 1
+    ctx = multiprocessing.get_context("fork")
+
+    ready = ctx.Event()
+    poller = ctx.Process(target=run_poller, name="energyd-poller",
+                         args=(store_name, model_path, interval_seconds, ready, actuals_path))
+    poller.start()
+    deadline = time.monotonic() + 30
+    while not ready.wait(0.1):
+        if not poller.is_alive() or time.monotonic() > deadline:
+            poller.terminate()
+            raise RuntimeError("Poller did not create the prediction store (see its output above).")
+
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.create_server((host, port), family=family, backlog=1024)
+    procs = [ctx.Process(target=_run_worker, name=f"energyd-http-{i}",
+                         args=(sock, host, port, store_name))
+             for i in range(workers)]
+    for p in procs:
+        p.start()
+    print(f"🚀 Serving on http://{host}:{port} with {workers} workers (poller pid {poller.pid})")
+
+    _exit_on_sigterm()
+    children = procs + [poller]
+    try:
+        # run until interrupted, or until any child dies
+        multiprocessing.connection.wait([p.sentinel for p in children])
+        print("⚠️ A serving process exited; shutting down.")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for p in children:
+            if p.is_alive():
+                p.terminate()
+        for p in children:
+            p.join(5)
+        sock.close()
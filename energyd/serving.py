@@ -0,0 +1,228 @@
+# serving.py  -- live weather polling, prediction and the Flask dashboard
+import collections
+import json
+import os
+import threading
+import traceback
+from datetime import datetime
+
+from . import config
+
+# keep last ~1 hour at the default 10 s polling interval
+MAX_RECORDS = 360
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates")
+
+
+def build_api_url(city_id=config.CITY_ID, key=config.API_KEY):
+    return f"https://api.openweathermap.org/data/2.5/weather?id={city_id}&appid={key}&units=metric"
+
+
+def load_model(path=config.MODEL_PATH):
+    """Load the trained model; returns None (heuristic fallback) if unavailable."""
+    if not os.path.exists(path):
+        print("⚠️ Model file not found:", path)
+        return None
+    try:
+        import joblib
+        model = joblib.load(path)
+        print("✅ Model loaded successfully:", path)
+        return model
+    except Exception as e:
+        print("⚠️ Error loading model:", e)
+        traceback.print_exc()
+        return None
+
+
+def get_live_weather(api_url=None):
+    """Fetch live weather data (includes icon + description)."""
+    import requests
+
+    try:
+        res = requests.get(api_url or build_api_url(), timeout=10)
+        if res.status_code != 200:
+            print("⚠️ Weather API error:", res.status_code, res.text)
+            return None
+
+        data = res.json()
+        weather = data.get("weather", [{}])[0]
+        return {
+            "temp": data["main"]["temp"],
+            "humidity": data["main"]["humidity"],
+            "wind": data["wind"]["speed"] if "wind" in data else 0.0,
+            "clouds": data.get("clouds", {}).get("all", 0),
+            "main": weather.get("main", ""),
+            "desc": weather.get("description", ""),
+            "icon": weather.get("icon", ""),  # e.g. "04d"
+        }
+    except Exception as e:
+        print("⚠️ Error fetching weather data:", e)
+        return None
+
+
+def local_now():
+    import pytz
+    return datetime.now(pytz.timezone(config.TIMEZONE))
+
+
+def predict_energy(model, weather, now=None, extra_features=None):
+    """Predict energy demand from weather and calendar features.
+
+    `extra_features` (e.g. lag / rolling / calendar features from
+    :class:`energyd.online.StreamingModel`) take precedence over the weather
+    and local-time values. Columns the model expects but that are not available live are
+    filled with 0. Falls back to a simple heuristic if there is no model or
+    prediction fails.
+    """
+    now = now or local_now()
+    hour = now.hour
+    dayofweek = now.weekday()
+
+    base_row = {
+        "hour": hour,
+        "dayofweek": dayofweek,
+        "month": now.month,
+        "is_weekend": 1 if dayofweek >= 5 else 0,
+        "temp": weather.get("temp"),
+        "humidity": weather.get("humidity"),
+        "wind": weather.get("wind"),
+        "clouds": weather.get("clouds"),
+    }
+
+    if model is not None and hasattr(model, "feature_name_"):
+        import pandas as pd
+
+        expected = list(model.feature_name_)
+        values = dict(base_row, **(extra_features or {}))
+        row = {}
+        for c in expected:
+            value = values.get(c)
+            try:
+                row[c] = 0.0 if value is None else float(value)
+            except (TypeError, ValueError):
+                row[c] = 0.0
+        try:
+            pred = model.predict(pd.DataFrame([row], columns=expected))[0]
+            return round(float(pred), 2)
+        except Exception as e:
+            print("⚠️ Model prediction error (shape/other):", e)
+
+    # fallback heuristic (keeps app running)
+    temp = base_row.get("temp", 25.0) or 25.0
+    humidity = base_row.get("humidity", 50.0) or 50.0
+    wind = base_row.get("wind", 2.0) or 2.0
+    pred = 20000 + (temp * 250) + (humidity * 30) - (wind * 40) + hour * 10
+    return round(float(pred), 2)
+
+
+class PredictionBuffer:
+    """Thread-safe, bounded in-process list of the latest prediction records."""
+
+    def __init__(self, maxlen=MAX_RECORDS):
+        self._records = collections.deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def append(self, record):
+        with self._lock:
+            self._records.append(record)
+
+    def snapshot(self):
+        with self._lock:
+            return list(self._records)
+
+    def to_json(self):
+        return json.dumps(self.snapshot())
+
+
+def make_record(weather, pred, now=None):
+    now = now or local_now()
+    return {
+        "time": now.strftime("%Y-%m-%d %H:%M"),
+        "predicted": pred,
+        "temp": weather["temp"],
+        "humidity": weather["humidity"],
+        "wind": weather["wind"],
+        "clouds": weather["clouds"],
+        "weather_main": weather["main"],
+        "weather_desc": weather["desc"],
+        "weather_icon": weather["icon"],
+    }
+
+
+def streaming_model(model, actuals_path, model_path):
+    """Wrap `model` for online updates from `actuals_path`; None if not possible."""
+    if not actuals_path:
+        return None
+    from .online import StreamingModel
+    try:
+        return StreamingModel(model, actuals_path, model_path)
+    except ValueError as e:
+        print("⚠️ Online updates disabled:", e)
+        return None
+
+
+def update_live_data(model, buffer, interval_seconds=10, stop_event=None, online=None):
+    """Continuously fetch weather, predict, and append records to `buffer`.
+
+    With `online` (a :class:`energyd.online.StreamingModel`), new actuals are
+    ingested each cycle and the latest (possibly updated) model is used.
+    """
+    print(f"🌦️ Starting real-time data updates every {interval_seconds} seconds...")
+    api_url = build_api_url()
+    stop_event = stop_event or threading.Event()
+
+    while not stop_event.is_set():
+        try:
+            extra_features = None
+            if online is not None:
+                model = online.refresh()
+                extra_features = online.live_features()
+            weather = get_live_weather(api_url)
+            if weather:
+                pred = predict_energy(model, weather, extra_features=extra_features)
+                record = make_record(weather, pred)
+                buffer.append(record)
+                print(f"[{record['time']}] 🔹 Predicted: {pred} MW | 🌡️ {weather['temp']}°C | {weather['desc']}")
+            else:
+                print("⚠️ Skipped update: Weather data unavailable.")
+        except Exception as e:
+            print("❌ Error in update loop:", e)
+            traceback.print_exc()
+
+        stop_event.wait(interval_seconds)
+
+
+def start_poller(model, buffer, interval_seconds=10, online=None):
+    """Run :func:`update_live_data` in a daemon thread; returns its stop event."""
+    stop_event = threading.Event()
+    threading.Thread(target=update_live_data, args=(model, buffer, interval_seconds, stop_event, online),
+                     daemon=True).start()
+    return stop_event
+
+
+def create_app(buffer):
+    """Flask app serving the dashboard and the records held by `buffer`."""
+    from flask import Flask, Response, render_template
+
+    app = Flask(__name__, template_folder=TEMPLATE_DIR)
+
+    @app.route("/")
+    def home():
+        return render_template("live_dashboard.html", city=config.CITY_NAME)
+
+    @app.route("/data")
+    def data():
+        return Response(buffer.to_json(), mimetype="application/json")
+
+    return app
+
+
+def serve(host="127.0.0.1", port=5000, interval_seconds=10, model_path=config.MODEL_PATH,
+          actuals_path=None):
+    """Development server: one process, poller thread + Flask debug server."""
+    buffer = PredictionBuffer()
+    model = load_model(model_path)
+    start_poller(model, buffer, interval_seconds, streaming_model(model, actuals_path, model_path))
+    app = create_app(buffer)
+    # debug=True but disable auto-reloader (use_reloader=False)
+    app.run(host=host, port=port, debug=True, use_reloader=False)
@@ -0,0 +1,223 @@
+# store.py  -- prediction records shared between processes via shared memory
+import collections
+import json
+import os
+import struct
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+DEFAULT_NAME = "energyd_predictions"
+DEFAULT_SIZE = 1 << 20  # 1 MiB, ~4000 records
+
+# how often readers check that the writer is still running
+OWNER_CHECK_SECONDS = 1.0
+# how long a reader waits for a write in progress before giving up on it
+STALL_SECONDS = 0.5
+
+# header: version (u64) at 0, payload length (u32) at 8, writer pid (u32) at 12,
+# flags (u32) at 16; the JSON payload follows
+_VERSION = struct.Struct("<Q")
+_U32 = struct.Struct("<I")
+_LENGTH_OFFSET, _PID_OFFSET, _FLAGS_OFFSET = 8, 12, 16
+_CLOSED = 1
+_HEADER_SIZE = 24
+
+
+def _attach(name):
+    """Attach to an existing segment without letting this process unlink it on exit."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    # Python < 3.13 registers attached segments with the resource tracker, which
+    # would unlink the segment when any reader exits. Skip the registration
+    # (unregistering afterwards would also drop a forked parent's entry).
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class SharedPredictionStore:
+    """Latest prediction records as JSON in a named shared-memory segment.
+
+    Exactly one process (the poller) creates the store and calls
+    :meth:`append`; any number of HTTP workers attach by name and read. The
+    header holds a version counter used as a seqlock: the writer makes it odd
+    while copying and even when done, and readers retry if it was odd or
+    changed during their copy. Readers keep the last payload they copied, so
+    repeated reads of an unchanged store cost one header read.
+
+    The header also records the writer's pid and a closed flag. A reader whose
+    writer closed the store or died re-attaches by name, so workers pick up a
+    restarted poller; until it is back they keep serving the last payload.
+    Writer and readers must share a pid namespace (same host / container).
+
+    Has the same ``append`` / ``snapshot`` / ``to_json`` interface as
+    :class:`energyd.serving.PredictionBuffer`.
+    """
+
+    def __init__(self, name, shm, owner, maxlen):
+        self._name = name
+        self._shm = shm
+        self._owner = owner
+        self._lock = threading.Lock()
+        self._next_check = 0.0
+        self._records = collections.deque(maxlen=maxlen)
+        self._version = 0
+        self._cached_version = None
+        self._cached = b"[]"
+
+    @classmethod
+    def create(cls, name=DEFAULT_NAME, size=DEFAULT_SIZE, maxlen=None):
+        """Create the segment (replacing a stale one); the caller becomes the only writer.
+
+        Raises RuntimeError if the segment exists and its writer is still running.
+        """
+        from .serving import MAX_RECORDS
+
+        try:
+            stale = _attach(name)
+        except FileNotFoundError:
+            pass
+        else:
+            pid = _U32.unpack_from(stale.buf, _PID_OFFSET)[0]
+            closed = _U32.unpack_from(stale.buf, _FLAGS_OFFSET)[0] & _CLOSED
+            stale.close()
+            if pid and not closed and _pid_alive(pid):
+                raise RuntimeError(f"Prediction store '{name}' is in use by a running poller (pid {pid}).")
+            stale.unlink()
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            raise RuntimeError(f"Prediction store '{name}' was just created by another poller.") from None
+        _U32.pack_into(shm.buf, _PID_OFFSET, os.getpid())
+        store = cls(name, shm, owner=True, maxlen=maxlen or MAX_RECORDS)
+        store._write(b"[]")
+        return store
+
+    @classmethod
+    def attach(cls, name=DEFAULT_NAME, timeout=10.0):
+        """Attach a reader, waiting up to `timeout` seconds for the writer to create it."""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return cls(name, _attach(name), owner=False, maxlen=None)
+            except FileNotFoundError:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.05)
+
+    @property
+    def name(self):
+        return self._name
+
+    # ---- writer ----
+    def _write(self, payload):
+        buf = self._shm.buf
+        capacity = len(buf) - _HEADER_SIZE
+        if len(payload) > capacity:
+            raise ValueError(f"Payload of {len(payload)} bytes exceeds store capacity {capacity}")
+        self._version += 1  # odd: write in progress
+        _VERSION.pack_into(buf, 0, self._version)
+        _U32.pack_into(buf, _LENGTH_OFFSET, len(payload))
+        buf[_HEADER_SIZE:_HEADER_SIZE + len(payload)] = payload
+        self._version += 1  # even: consistent
+        _VERSION.pack_into(buf, 0, self._version)
+
+    def append(self, record):
+        if not self._owner:
+            raise RuntimeError("Only the process that created the store can write to it.")
+        self._records.append(record)
+        payload = json.dumps(list(self._records)).encode()
+        # drop the oldest records if the segment is too small for all of them
+        while len(payload) > len(self._shm.buf) - _HEADER_SIZE and len(self._records) > 1:
+            self._records.popleft()
+            payload = json.dumps(list(self._records)).encode()
+        self._write(payload)
+
+    # ---- readers ----
+    def _writer_gone(self):
+        """True if the writer closed this segment or its process no longer exists."""
+        buf = self._shm.buf
+        if _U32.unpack_from(buf, _FLAGS_OFFSET)[0] & _CLOSED:
+            return True
+        pid = _U32.unpack_from(buf, _PID_OFFSET)[0]
+        return bool(pid) and not _pid_alive(pid)
+
+    def _reattach(self):
+        """Switch to the segment currently registered under the store's name.
+
+        Returns False if there is none yet, or it is still the old writer's
+        (try again on a later read).
+        """
+        try:
+            shm = _attach(self._name)
+        except FileNotFoundError:
+            return False
+        if _U32.unpack_from(shm.buf, _PID_OFFSET)[0] == _U32.unpack_from(self._shm.buf, _PID_OFFSET)[0]:
+            shm.close()
+            return False
+        self._shm.close()
+        self._shm = shm
+        self._cached_version = None
+        return True
+
+    def to_json(self):
+        """Current records as JSON bytes (cached until the writer publishes again)."""
+        with self._lock:
+            now = time.monotonic()
+            if not self._owner and now >= self._next_check:
+                self._next_check = now + OWNER_CHECK_SECONDS
+                if self._writer_gone():
+                    self._reattach()
+            buf = self._shm.buf
+            deadline = None
+            reattached = False
+            while True:
+                version = _VERSION.unpack_from(buf, 0)[0]
+                if version == self._cached_version or version == 0:
+                    return self._cached  # unchanged, or a new segment not yet written
+                if version % 2:
+                    if deadline is None:
+                        deadline = time.monotonic() + STALL_SECONDS
+                    elif time.monotonic() > deadline:
+                        # the writer died (or stalled) mid-write
+                        if (not self._owner and not reattached and self._writer_gone()
+                                and self._reattach()):
+                            buf, deadline, reattached = self._shm.buf, None, True
+                            continue
+                        # serve the last payload, and don't wait on this version again
+                        self._cached_version = version
+                        return self._cached
+                    time.sleep(0)
+                    continue
+                length = _U32.unpack_from(buf, _LENGTH_OFFSET)[0]
+                payload = bytes(buf[_HEADER_SIZE:_HEADER_SIZE + length])
+                if _VERSION.unpack_from(buf, 0)[0] == version:
+                    self._cached_version, self._cached = version, payload
+                    return payload
+
+    def snapshot(self):
+        return json.loads(self.to_json())
+
+    def close(self):
+        if self._owner:
+            # tell attached readers to look for a new writer
+            _U32.pack_into(self._shm.buf, _FLAGS_OFFSET, _CLOSED)
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
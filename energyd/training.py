@@ -0,0 +1,96 @@
+# training.py  -- LightGBM short-term load forecaster
+import os
+
+from . import config
+from .cleaning import read_processed_opsd
+from .features import TARGET, build_features
+
+MODEL_PARAMS = dict(
+    n_estimators=300,
+    learning_rate=0.05,
+    num_leaves=31,
+    subsample=0.8,
+    colsample_bytree=0.8,
+    random_state=42
+)
+
+
+def split_train_test(features, target=TARGET, test_fraction=0.1):
+    """Chronological split: the last `test_fraction` of rows is the test set."""
+    split_idx = int(len(features) * (1.0 - test_fraction))
+    train_df, test_df = features.iloc[:split_idx], features.iloc[split_idx:]
+    return (train_df.drop(columns=[target]), train_df[target],
+            test_df.drop(columns=[target]), test_df[target])
+
+
+def train_model(features, target=TARGET, test_fraction=0.1, **params):
+    """Fit the forecaster on a feature frame from :func:`energyd.features.build_features`.
+
+    Returns ``(model, metrics, predictions)`` where `predictions` is a frame of
+    actual vs predicted load on the test set.
+    """
+    import lightgbm as lgb
+    import pandas as pd
+    from sklearn.metrics import mean_absolute_error, r2_score
+
+    X_train, y_train, X_test, y_test = split_train_test(features, target, test_fraction)
+    model = lgb.LGBMRegressor(**dict(MODEL_PARAMS, **params))
+    model.fit(X_train, y_train)
+
+    preds = model.predict(X_test)
+    metrics = {
+        "mae": mean_absolute_error(y_test, preds),
+        "r2": r2_score(y_test, preds),
+    }
+    predictions = pd.DataFrame({"actual": y_test, "predicted": preds}, index=y_test.index)
+    return model, metrics, predictions
+
+
+def save_model(model, path):
+    """Pickle `model` to `path` with joblib (the format app serving loads).
+
+    Written to a temporary file and renamed, so a reader never sees a partial file.
+    """
+    import joblib
+
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    joblib.dump(model, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def plot_predictions(predictions, hours=200):
+    """Plot actual vs predicted load for the first `hours` of the test set."""
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(10, 4))
+    plt.plot(predictions["actual"].values[:hours], label="Actual", linewidth=2)
+    plt.plot(predictions["predicted"].values[:hours], label="Predicted", linewidth=2)
+    plt.title(f"Short-term Load Forecast (First {hours} Hours of Test Set)")
+    plt.xlabel("Time")
+    plt.ylabel("Load (MW)")
+    plt.legend()
+    plt.tight_layout()
+    plt.show()
+
+
+def run_training(base, show_plot=True):
+    """Train on data/processed/opsd_de_hourly.csv and save model + test predictions."""
+    df = read_processed_opsd(base)
+    print("Shape:", df.shape)
+    features = build_features(df)
+    model, metrics, predictions = train_model(features)
+
+    print("✅ Model Performance:")
+    print(f"MAE: {metrics['mae']:.2f}")
+    print(f"R²:  {metrics['r2']:.3f}")
+    if show_plot:
+        plot_predictions(predictions)
+
+    out_csv = config.processed_path(base, config.PREDICTIONS_FILE)
+    predictions.to_csv(out_csv)
+    print("Saved predictions to:", out_csv)
+
+    model_path = os.path.join(base, config.MODEL_PATH)
+    save_model(model, model_path)
+    print("✅ Model saved as", model_path)
+    return model, metrics
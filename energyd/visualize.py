@@ -0,0 +1,256 @@
+# visualize.py  -- plots for robust dispatch results
+#
+# Long series are downsampled before drawing (LTTB or min/max per bucket), so a
+# year of hourly dispatch draws as fast as a week. Headless rendering uses the
+# Agg canvas directly (no pyplot / display needed), can fan out over processes,
+# and names output images by a hash of the input data + render settings, so
+# unchanged runs are not re-rendered.
+import glob
+import hashlib
+import io
+import json
+import os
+import re
+
+import numpy as np
+
+from . import config
+
+DEFAULT_MAX_POINTS = 2000
+# bump when the figure layout changes, to invalidate cached images
+RENDER_VERSION = 1
+
+
+def lttb_indices(x, y, n_out):
+    """Indices of `n_out` points chosen by Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last point and, per bucket, the point forming the
+    largest triangle with the previous pick and the next bucket's mean.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.nan_to_num(np.asarray(y, dtype=float))
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    idx = np.empty(n_out, dtype=int)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        xs, ys = x[start:end], y[start:end]
+        area = np.abs((x[a] - avg_x) * (ys - y[a]) - (x[a] - xs) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        idx[i + 1] = a
+    return idx
+
+
+def minmax_indices(y, n_out):
+    """Indices of the min and max of each of ``n_out // 2`` buckets (plus the ends)."""
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    y = np.nan_to_num(np.asarray(y, dtype=float))
+    edges = np.linspace(0, n, max(1, n_out // 2) + 1).astype(int)
+    picks = [0, n - 1]
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end > start:
+            segment = y[start:end]
+            picks += [start + int(np.argmin(segment)), start + int(np.argmax(segment))]
+    return np.unique(picks)
+
+
+def downsample_indices(x, y, max_points=DEFAULT_MAX_POINTS, method="lttb"):
+    if not max_points or len(x) <= max_points:
+        return np.arange(len(x))
+    if method == "lttb":
+        return lttb_indices(x, y, max_points)
+    if method == "minmax":
+        return minmax_indices(y, max_points)
+    raise ValueError(f"Unknown downsampling method '{method}' (use 'lttb' or 'minmax').")
+
+
+def draw_mix(ax, df, max_points=DEFAULT_MAX_POINTS, method="lttb", title=None):
+    """Energy-mix stackplot; points are picked on total generation so layers stay aligned."""
+    total = df['solar_used'] + df['wind_used'] + df['gas_used']
+    sub = df.iloc[downsample_indices(df['hour'].values, total.values, max_points, method)]
+    ax.stackplot(
+        sub['hour'],
+        sub['solar_used'],
+        sub['wind_used'],
+        sub['gas_used'],
+        labels=['Solar', 'Wind', 'Gas'],
+        alpha=0.8
+    )
+    ax.set_title(title or f"Robust Energy Dispatch Plan ({len(df) / 24:.0f} Days)")
+    ax.set_xlabel("Hour")
+    ax.set_ylabel("Generation (MWh)")
+    ax.legend(loc="upper left")
+
+
+def draw_soc(ax, df, max_points=DEFAULT_MAX_POINTS, method="lttb", title=None):
+    """Battery state-of-charge line."""
+    sub = df.iloc[downsample_indices(df['hour'].values, df['soc'].values, max_points, method)]
+    ax.plot(sub['hour'], sub['soc'], color='purple', linewidth=2)
+    ax.set_title(title or "Battery State of Charge (SOC)")
+    ax.set_xlabel("Hour")
+    ax.set_ylabel("Energy Stored (MWh)")
+    ax.grid(True)
+
+
+def plot_dispatch(df, max_points=DEFAULT_MAX_POINTS, method="lttb"):
+    """Energy-mix and battery SOC figures for a dispatch run (pyplot, for interactive use)."""
+    import matplotlib.pyplot as plt
+
+    fig_mix, ax = plt.subplots(figsize=(12, 6))
+    draw_mix(ax, df, max_points, method)
+    fig_mix.tight_layout()
+
+    fig_soc, ax = plt.subplots(figsize=(10, 4))
+    draw_soc(ax, df, max_points, method)
+    fig_soc.tight_layout()
+    return fig_mix, fig_soc
+
+
+def render_key(data, max_points, method, dpi, fmt):
+    """Cache key: hash of the raw input bytes and every setting that affects the image."""
+    h = hashlib.sha256(data)
+    h.update(json.dumps([RENDER_VERSION, max_points, method, dpi, fmt]).encode())
+    return h.hexdigest()[:16]
+
+
+def render_dispatch(path, out_dir, max_points=DEFAULT_MAX_POINTS, method="lttb", dpi=100, fmt="png"):
+    """Render the mix and SOC images for one results CSV without a display.
+
+    Returns ``(output_paths, cached)``; `cached` is True if the images for this
+    exact input already existed and nothing was drawn.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    stem = os.path.splitext(os.path.basename(path))[0]
+    key = render_key(data, max_points, method, dpi, fmt)
+    outputs = [os.path.join(out_dir, f"{stem}-{key}-{kind}.{fmt}") for kind in ("mix", "soc")]
+    if all(os.path.exists(p) for p in outputs):
+        return outputs, True
+
+    import pandas as pd
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    df = pd.read_csv(io.BytesIO(data))
+    os.makedirs(out_dir, exist_ok=True)
+    for out, (draw, size) in zip(outputs, [(draw_mix, (12, 6)), (draw_soc, (10, 4))]):
+        fig = Figure(figsize=size)
+        FigureCanvasAgg(fig)
+        draw(fig.add_subplot(), df, max_points, method)
+        fig.tight_layout()
+        # write-then-rename so a concurrent or interrupted render never leaves a partial cache hit
+        tmp = f"{out}.tmp{os.getpid()}"
+        fig.savefig(tmp, dpi=dpi, format=fmt)
+        os.replace(tmp, out)
+    return outputs, False
+
+
+def expand_runs(paths):
+    """Results CSVs from files and directories (all *.csv inside), sorted and de-duplicated."""
+    runs = []
+    for p in paths:
+        runs += sorted(glob.glob(os.path.join(p, "*.csv"))) if os.path.isdir(p) else [p]
+    return list(dict.fromkeys(runs))
+
+
+def _render_entry(path, out_dir, **render_kwargs):
+    """Index entry for one run; a run that cannot be rendered gets an ``error``."""
+    try:
+        outputs, cached = render_dispatch(path, out_dir, **render_kwargs)
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+    return {"images": outputs, "cached": cached}
+
+
+def render_many(paths, out_dir, jobs=None, **render_kwargs):
+    """Render every run, in parallel across `jobs` processes (default: all cores).
+
+    A run that fails (missing file, wrong columns, ...) is recorded with its
+    error and does not stop the others. The entries are merged into
+    ``index.json`` in `out_dir` (runs from earlier calls are kept) and the
+    entries of this call are returned. Older images of the rendered runs
+    (from previous data or settings) are deleted.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    runs = expand_runs(paths)
+    jobs = min(jobs or os.cpu_count() or 1, max(1, len(runs)))
+    if jobs == 1:
+        entries = [_render_entry(p, out_dir, **render_kwargs) for p in runs]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(_render_entry, p, out_dir, **render_kwargs) for p in runs]
+            entries = [f.result() for f in futures]
+    rendered = dict(zip(runs, entries))
+
+    os.makedirs(out_dir, exist_ok=True)
+    index_path = os.path.join(out_dir, "index.json")
+    index = {}
+    if os.path.exists(index_path):
+        try:
+            with open(index_path) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            print("⚠️ Rewriting unreadable", index_path)
+    index.update(rendered)
+    with open(index_path, "w") as f:
+        json.dump(index, f, indent=2)
+    prune_images(out_dir, [p for p, entry in rendered.items() if "error" not in entry],
+                 index, render_kwargs.get("fmt", "png"))
+    return rendered
+
+
+def prune_images(out_dir, runs, index, fmt="png"):
+    """Delete ``{stem}-{key}-{kind}.{fmt}`` images of `runs` not referenced by `index`."""
+    keep = {os.path.basename(p) for entry in index.values() for p in entry.get("images", [])}
+    for stem in {os.path.splitext(os.path.basename(p))[0] for p in runs}:
+        # exact key width, so run "a" never claims the images of run "a-2"
+        pattern = re.compile(re.escape(stem) + r"-[0-9a-f]{16}-(mix|soc)\." + re.escape(fmt))
+        for path in glob.glob(os.path.join(glob.escape(out_dir), f"{glob.escape(stem)}-*.{fmt}")):
+            name = os.path.basename(path)
+            if name not in keep and pattern.fullmatch(name):
+                os.remove(path)
+
+
+def run_visualize(base, paths=None, out_dir=None, show=False, jobs=None,
+                  max_points=DEFAULT_MAX_POINTS, method="lttb"):
+    """Plot dispatch results (default: data/processed/robust_dispatch_results.csv).
+
+    With `show`, the figures open in interactive windows as before; otherwise
+    images are rendered headless to `out_dir` (default: data/processed/figures)
+    and the entries of this call are returned (see :func:`render_many`).
+    """
+    paths = paths or [config.processed_path(base, config.DISPATCH_FILE)]
+    if show:
+        import matplotlib.pyplot as plt
+        import pandas as pd
+
+        for path in expand_runs(paths):
+            df = pd.read_csv(path)
+            print("Loaded:", path)
+            print(df.head())
+            plot_dispatch(df, max_points, method)
+        plt.show()
+        return None
+
+    out_dir = out_dir or config.processed_path(base, "figures")
+    index = render_many(paths, out_dir, jobs=jobs, max_points=max_points, method=method)
+    failed = {p: entry["error"] for p, entry in index.items() if "error" in entry}
+    cached = sum(entry.get("cached", False) for entry in index.values())
+    print(f"✅ Rendered {len(index) - cached - len(failed)} run(s), {cached} unchanged (cached) -> {out_dir}")
+    for path, error in failed.items():
+        print(f"❌ {path}: {error}")
+    return index